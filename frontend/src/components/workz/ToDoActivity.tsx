@@ -94,7 +94,7 @@ function renderActivityItem(item: ActivityItem) {
 export function ToDoActivity(props: ToDoActivityProps) {
   const { todoId } = props;
   const [comment, setComment] = React.useState("");
-  const { activity, addComment } = useTodoActivity(todoId);
+  const { activity, hasMore, isLoading, loadMore, addComment } = useTodoActivity(todoId);
 
   const onAdd = () => {
     const c = comment.trim();
@@ -140,6 +140,11 @@ export function ToDoActivity(props: ToDoActivityProps) {
           </Typography>
         )}
       </List>
+      {hasMore && (
+        <Button size="small" onClick={() => void loadMore()} disabled={isLoading} aria-label="Load older activity">
+          Load older
+        </Button>
+      )}
     </Box>
   );
 }
\ No newline at end of file
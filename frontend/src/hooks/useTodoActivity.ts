@@ -1,8 +1,8 @@
 /**
  * useTodoActivity (real endpoints)
  * - Integrates with custom backend under workz.api
- *   GET  /api/method/workz.api.list_history?todo_id=NAME
- *       -> [{ id, author, content, created_at, type }]
+ *   GET  /api/method/workz.api.list_history?todo_id=NAME&limit=50&offset=0
+ *       -> { items: [{ id, author, content, created_at, type }], has_more }
  *   POST /api/method/workz.api.add_comment
  *       body { todo_id, content } -> returns created item
  */
@@ -29,6 +29,11 @@ interface RawActivity {
   meta?: Record<string, unknown> | null;
 }
 
+interface RawHistoryPage {
+  items: RawActivity[];
+  has_more: boolean;
+}
+
 function mapRaw(a: RawActivity): ActivityItem {
   return {
     id: a.id,
@@ -40,21 +45,30 @@ function mapRaw(a: RawActivity): ActivityItem {
   };
 }
 
+const PAGE_SIZE = 50;
+
 export function useTodoActivity(todoId: string | null) {
   const [items, setItems] = useState<ActivityItem[]>([]);
+  const [hasMore, setHasMore] = useState<boolean>(false);
   const [isLoading, setLoading] = useState<boolean>(false);
   const [error, setError] = useState<Error | null>(null);
 
   const refetch = useCallback(async () => {
     if (!todoId) {
       setItems([]);
+      setHasMore(false);
       return;
     }
     setLoading(true);
     setError(null);
     try {
-      const data = await getJSON<RawActivity[]>("/api/method/workz.api.list_history", { todo_id: todoId });
-      setItems((data || []).map(mapRaw));
+      const data = await getJSON<RawHistoryPage>("/api/method/workz.api.list_history", {
+        todo_id: todoId,
+        limit: PAGE_SIZE,
+        offset: 0
+      });
+      setItems((data?.items || []).map(mapRaw));
+      setHasMore(Boolean(data?.has_more));
     } catch (e: any) {
       setError(e instanceof Error ? e : new Error(String(e)));
     } finally {
@@ -62,6 +76,31 @@ export function useTodoActivity(todoId: string | null) {
     }
   }, [todoId]);
 
+  // Append the next older page; comments posted since the first page are
+  // newest, so they shift the server offset exactly like loaded items do
+  const loadMore = useCallback(async () => {
+    if (!todoId || !hasMore || isLoading) return;
+    setLoading(true);
+    setError(null);
+    try {
+      const offset = items.filter(i => !i.id.startsWith("temp-")).length;
+      const data = await getJSON<RawHistoryPage>("/api/method/workz.api.list_history", {
+        todo_id: todoId,
+        limit: PAGE_SIZE,
+        offset
+      });
+      setItems(prev => {
+        const seen = new Set(prev.map(i => i.id));
+        return [...prev, ...(data?.items || []).map(mapRaw).filter(i => !seen.has(i.id))];
+      });
+      setHasMore(Boolean(data?.has_more));
+    } catch (e: any) {
+      setError(e instanceof Error ? e : new Error(String(e)));
+    } finally {
+      setLoading(false);
+    }
+  }, [todoId, hasMore, isLoading, items]);
+
   useEffect(() => {
     void refetch();
   }, [refetch]);
@@ -101,9 +140,11 @@ export function useTodoActivity(todoId: string | null) {
 
   return useMemo(() => ({
     activity: items,
+    hasMore,
     isLoading,
     error,
     refetch,
+    loadMore,
     addComment
-  }), [items, isLoading, error, refetch, addComment]);
+  }), [items, hasMore, isLoading, error, refetch, loadMore, addComment]);
 }
\ No newline at end of file
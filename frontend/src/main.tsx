@@ -14,12 +14,18 @@ import { FrappeProvider } from "frappe-react-sdk";
 import { ThemeContextProvider } from "./contexts/ThemeContext";
 import App from "./App";
 
-ReactDOM.createRoot(document.getElementById("root") as HTMLElement).render(
-  <React.StrictMode>
-    <FrappeProvider url={window.location.origin}>
-      <ThemeContextProvider>
-        <App />
-      </ThemeContextProvider>
-    </FrappeProvider>
-  </React.StrictMode>
-);
+// Desk boot is fetched by index.html in parallel with this bundle; wait for it
+// before the first render so frappe.boot is populated
+const bootReady: Promise<unknown> = (window as any).__WORKZ_BOOT_PROMISE__ ?? Promise.resolve();
+
+bootReady.finally(() => {
+  ReactDOM.createRoot(document.getElementById("root") as HTMLElement).render(
+    <React.StrictMode>
+      <FrappeProvider url={window.location.origin}>
+        <ThemeContextProvider>
+          <App />
+        </ThemeContextProvider>
+      </FrappeProvider>
+    </React.StrictMode>
+  );
+});
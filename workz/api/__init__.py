@@ -11,5 +11,9 @@ from .activity import list_history, add_comment  # noqa: F401
 #  - /api/method/workz.api.get_user_todos_alternative
 from .references import resolve_references, get_doctype_title_field, resolve_single_reference, get_user_todos, get_user_todos_alternative  # noqa: F401
 
+# Expose SPA bootstrap API:
+#  - /api/method/workz.api.boot
+from .spa import boot  # noqa: F401
+
 # Existing security utilities can also live here via explicit imports if desired:
 # from .security import csrf_token  # noqa: F401
\ No newline at end of file
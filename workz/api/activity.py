@@ -1,7 +1,28 @@
 import frappe
 from frappe import _
-from frappe.utils import get_fullname
+from frappe.utils import cint, get_fullname
 import json
+import re
+
+try:
+    # orjson parses Version payloads considerably faster than stdlib json
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
+
+# Matches "... on 2025-08-08 15:22:26.808608", "... on 2025-08-08" and
+# standalone "2025-08-08 15:22:26" timestamps in a single pass
+TIMESTAMP_PATTERN = re.compile(
+    r'\s+on\s+\d{4}-\d{2}-\d{2}(?:\s+\d{2}:\d{2}:\d{2}(?:\.\d+)?)?'
+    r'|\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}(?:\.\d+)?'
+)
+
+# Shortest value TIMESTAMP_PATTERN can match (" on 2025-08-08")
+MIN_TIMESTAMP_LENGTH = 14
+
+# Enum-like fields whose values never carry timestamps
+NO_CLEAN_FIELDS = frozenset({"status", "priority", "allocated_to", "reference_name", "reference_type"})
 
 
 def _user_display(user: str) -> str:
@@ -11,15 +32,34 @@ def _user_display(user: str) -> str:
         return user or "User"
 
 
-def format_field_change(field_name, old_value, new_value):
-    """Format a field change with before/after values"""
+def _user_display_map(users) -> dict:
+    """Resolve display names for a set of users with a single query."""
+    users = [user for user in users if user]
+    if not users:
+        return {}
+    return {
+        user.name: user.full_name or user.name
+        for user in frappe.get_all(
+            "User",
+            filters={"name": ["in", users]},
+            fields=["name", "full_name"]
+        )
+    }
+
+
+def format_field_change(field_name, old_value, new_value, user_names=None):
+    """
+    Format a field change with before/after values.
+    user_names optionally maps users to display names resolved in a batch.
+    """
     # Handle None values
     old_display = "None" if old_value is None else str(old_value)
     new_display = "None" if new_value is None else str(new_value)
 
     # Clean up values by removing timestamps and usernames that are redundant
-    old_display = clean_field_value(old_display)
-    new_display = clean_field_value(new_display)
+    if field_name not in NO_CLEAN_FIELDS:
+        old_display = clean_field_value(old_display)
+        new_display = clean_field_value(new_display)
 
     # Special formatting for specific fields
     if field_name == "status":
@@ -27,8 +67,10 @@ def format_field_change(field_name, old_value, new_value):
     elif field_name == "priority":
         return f"Priority: {old_display} → {new_display}"
     elif field_name == "allocated_to":
-        old_name = _user_display(old_display) if old_display != "None" else "None"
-        new_name = _user_display(new_display) if new_display != "None" else "None"
+        # Users missing from a batch-resolved map have no User row; show the id
+        display = (lambda user: user_names.get(user, user)) if user_names is not None else _user_display
+        old_name = display(old_display) if old_display != "None" else "None"
+        new_name = display(new_display) if new_display != "None" else "None"
         return f"Assigned to: {old_name} → {new_name}"
     elif field_name == "description":
         return f"Subject updated"
@@ -46,17 +88,10 @@ def clean_field_value(value):
     if not value or value == "None":
         return value
 
-    # Remove timestamps from approval notes and similar fields
-    import re
-
-    # Remove patterns like "by Administrator on 2025-08-08 15:22:26.808608"
-    value = re.sub(r'\s+on\s+\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}(\.\d+)?', '', value)
-
-    # Remove patterns like "Administrator on 2025-08-08"
-    value = re.sub(r'\s+on\s+\d{4}-\d{2}-\d{2}', '', value)
-
-    # Remove standalone timestamps
-    value = re.sub(r'\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2}:\d{2}(\.\d+)?', '', value)
+    # Remove timestamps from approval notes and similar fields, skipping the
+    # regex for values too short or without a date separator to contain one
+    if len(value) >= MIN_TIMESTAMP_LENGTH and "-" in value:
+        value = TIMESTAMP_PATTERN.sub('', value)
 
     # Clean up extra whitespace
     value = ' '.join(value.split())
@@ -65,46 +100,122 @@ def clean_field_value(value):
 
 
 @frappe.whitelist(allow_guest=False)
-def list_history(todo_id: str):
+def list_history(todo_id: str, limit: int = 50, offset: int = 0, include_raw: bool = False):
     """
-    Return activity items for a ToDo.
-    Returns both version history (status changes, assignments) and comments.
+    Return a page of activity items for a ToDo, newest first.
+    Returns both version history (status changes, assignments) and comments
+    as {"items": [...], "has_more": bool}. Pass include_raw=1 to also get the
+    parsed Version payload under meta.version_data.
     """
     if not todo_id:
         frappe.throw("todo_id is required", frappe.ValidationError)
 
+    limit = cint(limit)
+    offset = cint(offset)
+    include_raw = bool(cint(include_raw))
+    if limit < 1 or limit > 200:
+        frappe.throw("limit must be between 1 and 200", frappe.ValidationError)
+    if offset < 0:
+        frappe.throw("offset cannot be negative", frappe.ValidationError)
+
     # Check if user has read permission
     if not frappe.has_permission("ToDo", "read", todo_id):
         frappe.throw(_("Not permitted to read ToDo"))
 
     items = []
 
-    # Get document versions from Version doctype
-    versions = frappe.get_all(
-        "Version",
-        filters={
-            "ref_doctype": "ToDo",
-            "docname": todo_id
-        },
-        fields=["name", "owner", "creation", "data"],
-        order_by="creation desc"
+    # Get versions and comments in one round trip, already newest first.
+    # Version data blobs are left out so the sort only moves small rows.
+    rows = frappe.db.sql(
+        """
+        SELECT name, owner, creation, NULL AS content, 'version' AS kind
+        FROM `tabVersion`
+        WHERE ref_doctype = 'ToDo' AND docname = %(todo_id)s
+        UNION ALL
+        SELECT name, owner, creation, content, 'comment' AS kind
+        FROM `tabComment`
+        WHERE reference_doctype = 'ToDo' AND reference_name = %(todo_id)s
+            AND comment_type = 'Comment'
+        ORDER BY creation DESC, name DESC
+        LIMIT %(limit)s OFFSET %(offset)s
+        """,
+        # Fetch one extra row to know whether an older page exists
+        {"todo_id": todo_id, "limit": limit + 1, "offset": offset},
+        as_dict=True
     )
 
-    # Process version data
-    for version in versions:
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+
+    # Load version payloads only for the versions on this page
+    version_names = [row.name for row in rows if row.kind == "version"]
+    version_payloads = dict(
+        frappe.get_all(
+            "Version",
+            filters={"name": ["in", version_names]},
+            fields=["name", "data"],
+            as_list=True
+        )
+    ) if version_names else {}
+
+    bad_versions = []
+
+    # Parse version payloads up front so assignees can be resolved with authors
+    version_data_map = {}
+    users = {row.owner for row in rows}
+    for name, data in version_payloads.items():
+        try:
+            version_data = json_loads(data) if data else {}
+            version_data_map[name] = version_data
+            changed = version_data.get("changed")
+            if isinstance(changed, list):
+                for change in changed:
+                    if len(change) >= 3 and change[0] == "allocated_to":
+                        users.update(value for value in change[1:3] if isinstance(value, str))
+        except (json.JSONDecodeError, AttributeError, KeyError, TypeError) as e:
+            bad_versions.append((name, str(e)))
+
+    # Resolve author and assignee names once per distinct user
+    user_names = _user_display_map(users)
+
+    # creation is returned as a datetime; Frappe's response encoder formats it
+    # exactly as str() would, so no per-row conversion is needed here
+    for row in rows:
+        # Add comments as activity items
+        if row.kind == "comment":
+            items.append({
+                "id": row.name,
+                "type": "comment",
+                "author": {"name": user_names.get(row.owner) or row.owner or "User"},
+                "content": row.content or "",
+                "created_at": row.creation,
+                "meta": None
+            })
+            continue
+
+        # Process version data
+        if row.name not in version_data_map and row.name in version_payloads:
+            # Payload failed to parse above and is already in bad_versions
+            continue
         try:
-            version_data = json.loads(version.data) if version.data else {}
+            version_data = version_data_map.get(row.name, {})
+
+            # Only the change lists are needed unless the raw payload is requested
+            changed = version_data.get("changed")
+            added = version_data.get("added")
+            removed = version_data.get("removed")
+
             changed_fields = []
             change_type = "status_change"
 
-            if "changed" in version_data and version_data["changed"]:
+            if changed:
                 # "changed" is a list of [field_name, old_value, new_value] arrays
-                if isinstance(version_data["changed"], list):
-                    for change in version_data["changed"]:
+                if isinstance(changed, list):
+                    for change in changed:
                         if len(change) >= 3:
                             field_name, old_value, new_value = change[0], change[1], change[2]
                             # Format the change with before/after values
-                            change_desc = format_field_change(field_name, old_value, new_value)
+                            change_desc = format_field_change(field_name, old_value, new_value, user_names)
                             if change_desc:  # Only add non-None descriptions
                                 changed_fields.append(change_desc)
                                 # Determine activity type based on field
@@ -113,63 +224,42 @@ def list_history(todo_id: str):
                         elif len(change) > 0:
                             changed_fields.append(change[0])
                 else:
-                    changed_fields = list(version_data["changed"].keys()) if isinstance(version_data["changed"], dict) else []
+                    changed_fields = list(changed.keys()) if isinstance(changed, dict) else []
 
-            if "added" in version_data and version_data["added"]:
+            if added:
                 # Document was created
                 change_type = "status_change"
                 changed_fields = ["ToDo created"]
             elif not changed_fields:
                 # Fallback for other changes
-                if "removed" in version_data and version_data["removed"]:
+                if removed:
                     changed_fields = ["Fields removed"]
                 else:
                     changed_fields = ["ToDo updated"]
 
+            meta = {"changes": changed_fields}
+            if include_raw:
+                meta["version_data"] = version_data
+
             # Add version as activity item
             items.append({
-                "id": version.name,
+                "id": row.name,
                 "type": change_type,
-                "author": {"name": _user_display(version.owner)},
+                "author": {"name": user_names.get(row.owner) or row.owner or "User"},
                 "content": "; ".join(changed_fields),
-                "created_at": str(version.creation),
-                "meta": {
-                    "changes": changed_fields,
-                    "version_data": version_data
-                }
+                "created_at": row.creation,
+                "meta": meta
             })
-        except (json.JSONDecodeError, KeyError, TypeError) as e:
-            # Log the error but continue processing other versions
-            frappe.log_error(f"Error processing version {version.name}: {str(e)}")
+        except (json.JSONDecodeError, AttributeError, KeyError, TypeError) as e:
+            # Collect the error and continue processing other versions
+            bad_versions.append((row.name, str(e)))
             continue
 
-    # Get comments from Comment doctype
-    comments = frappe.get_all(
-        "Comment",
-        filters={
-            "reference_doctype": "ToDo",
-            "reference_name": todo_id,
-            "comment_type": "Comment"
-        },
-        fields=["name", "owner", "creation", "content"],
-        order_by="creation desc"
-    )
-
-    # Add comments as activity items
-    for comment in comments:
-        items.append({
-            "id": comment.name,
-            "type": "comment",
-            "author": {"name": _user_display(comment.owner)},
-            "content": comment.content or "",
-            "created_at": str(comment.creation),
-            "meta": None
-        })
-
-    # Sort all items by creation date (newest first)
-    items.sort(key=lambda x: x["created_at"], reverse=True)
+    # Log once per request so corrupt histories don't amplify into many writes
+    if bad_versions:
+        frappe.log_error(f"Version parse errors for {todo_id}: {bad_versions[:20]}")
 
-    return items
+    return {"items": items, "has_more": has_more}
 
 
 @frappe.whitelist(allow_guest=False)
@@ -188,7 +278,7 @@ def add_comment(todo_id: str, content: str):
     if not frappe.has_permission("ToDo", "read", todo_id):
         frappe.throw(_("Not permitted to comment on ToDo"))
 
-    # Create Comment
+    # Create Comment; the request commits on return, so no explicit commit here
     comment = frappe.get_doc({
         "doctype": "Comment",
         "comment_type": "Comment",
@@ -200,7 +290,6 @@ def add_comment(todo_id: str, content: str):
     })
 
     comment.insert(ignore_permissions=True)
-    frappe.db.commit()
 
     # Return in activity schema format
     return {
@@ -208,6 +297,6 @@ def add_comment(todo_id: str, content: str):
         "type": "comment",
         "author": {"name": _user_display(comment.owner)},
         "content": comment.content or "",
-        "created_at": str(comment.creation),
+        "created_at": comment.creation,
         "meta": None
     }
\ No newline at end of file
@@ -8,6 +8,51 @@ import frappe
 from frappe import _
 
 
+def _title_field(doctype):
+    """
+    Return the title field for a doctype, falling back to "name".
+    frappe.get_meta is cached locally and in Redis and is invalidated by
+    Frappe on every DocType / Property Setter change.
+    """
+    return frappe.get_meta(doctype).title_field or "name"
+
+
+def _get_valid_references(current_user, pairs):
+    """
+    Return the subset of (doctype, name) pairs referenced by todos the user
+    created or is assigned to. Memoized on frappe.local for the request.
+    """
+    cached = getattr(frappe.local, "_workz_valid_refs", None)
+    if cached is None or cached[0] != current_user:
+        cached = frappe.local._workz_valid_refs = (current_user, {})
+    checked = cached[1]
+
+    # Only look up pairs not already checked in this request
+    pending = [pair for pair in set(pairs) if pair not in checked]
+    if pending:
+        placeholders = ", ".join(["(%s, %s)"] * len(pending))
+        params = [current_user, current_user]
+        for pair in pending:
+            params.extend(pair)
+            checked[pair] = False
+
+        # Filter at the DB so rows fetched are bounded by the input, not the user's todo count
+        rows = frappe.db.sql(
+            f"""
+            SELECT DISTINCT reference_type, reference_name
+            FROM `tabToDo`
+            WHERE reference_type != 'ToDo'
+            AND (owner = %s OR allocated_to = %s)
+            AND (reference_type, reference_name) IN ({placeholders})
+            """,
+            params
+        )
+        for reference_type, reference_name in rows:
+            checked[(reference_type, reference_name)] = True
+
+    return {pair for pair in pairs if checked[pair]}
+
+
 @frappe.whitelist(allow_guest=False)
 def resolve_references(references):
     """
@@ -36,98 +81,98 @@ def resolve_references(references):
     resolved = {}
     current_user = frappe.session.user
 
-    # First, verify that these references come from todos the user can access
-    # Get all todos the user created or is assigned to using the same approach as get_user_todos
-
-    # Get todos where user is owner
-    owned_todos = frappe.get_all(
-        "ToDo",
-        filters={
-            "reference_type": ["!=", "ToDo"],
-            "owner": current_user
-        },
-        fields=["reference_type", "reference_name"]
-    )
-
-    # Get todos where user is assigned
-    assigned_todos = frappe.get_all(
-        "ToDo",
-        filters={
-            "reference_type": ["!=", "ToDo"],
-            "allocated_to": current_user
-        },
-        fields=["reference_type", "reference_name"]
-    )
-
-    # Combine the results
-    user_todos = owned_todos + assigned_todos
+    # Only well-formed references are considered
+    pairs = [
+        (ref['doctype'], ref['name'])
+        for ref in references
+        if isinstance(ref, dict)
+        and isinstance(ref.get('doctype'), str)
+        and isinstance(ref.get('name'), str)
+    ]
 
-    # Create a set of valid references for this user
-    valid_references = set()
-    for todo in user_todos:
-        if todo.reference_type and todo.reference_name:
-            valid_references.add(f"{todo.reference_type}:{todo.reference_name}")
+    # First, verify that these references come from todos the user can access
+    valid_references = _get_valid_references(current_user, pairs)
 
     # Group references by doctype for efficient processing
     by_doctype = {}
-    for ref in references:
-        if not isinstance(ref, dict) or 'doctype' not in ref or 'name' not in ref:
-            continue
-
-        doctype = ref['doctype']
-        name = ref['name']
-        ref_key = f"{doctype}:{name}"
-
+    perm_cache = {}
+    for doctype, name in pairs:
         # Only process references that come from user's todos
-        if ref_key not in valid_references:
+        if (doctype, name) not in valid_references:
             continue
 
-        # Check if user has read permission for this doctype
-        if not frappe.has_permission(doctype, "read"):
+        # Check if user has read permission for this doctype (once per doctype)
+        allowed = perm_cache.get(doctype)
+        if allowed is None:
+            allowed = perm_cache[doctype] = frappe.has_permission(doctype, "read")
+        if not allowed:
             continue
 
         if doctype not in by_doctype:
             by_doctype[doctype] = []
         by_doctype[doctype].append(name)
     
-    # Resolve each doctype
+    # Build one UNION ALL query across all doctypes that have a title field.
+    # Titles are cast to text so Data/Int/Date title fields can share a column.
+    text_type = "TEXT" if frappe.db.db_type == "postgres" else "CHAR"
+    queries = []
+    failed_doctypes = []
     for doctype, names in by_doctype.items():
         try:
-            # Get doctype metadata to find title field
-            meta = frappe.get_meta(doctype)
-            title_field = meta.title_field or "name"
-            
-            # Fetch documents with title field
-            fields = ["name"]
-            if title_field != "name":
-                fields.append(title_field)
-            
-            # Batch fetch documents
-            docs = frappe.get_all(
-                doctype,
-                filters={"name": ["in", names]},
-                fields=fields
-            )
-            
-            # Build resolution map
-            for doc in docs:
-                key = f"{doctype}:{doc.name}"
-                
-                # Use title field if available, otherwise use name
-                if title_field != "name" and doc.get(title_field):
-                    resolved[key] = str(doc[title_field]).strip()
-                else:
-                    resolved[key] = doc.name
-                    
+            # Get title field from doctype metadata
+            title_field = _title_field(doctype)
         except Exception as e:
-            # Log error but don't fail the entire request
-            frappe.log_error(f"Failed to resolve {doctype} references: {str(e)}")
-            
-            # Add fallback entries for this doctype
+            # Collect the error but don't fail the entire request
+            failed_doctypes.append((doctype, str(e)))
+            title_field = "name"
+
+        # Doctypes without a title field resolve to their names directly
+        if title_field == "name":
             for name in names:
-                key = f"{doctype}:{name}"
-                resolved[key] = name
-    
+                resolved[f"{doctype}:{name}"] = name
+            continue
+
+        placeholders = ", ".join(["%s"] * len(names))
+        queries.append((
+            doctype,
+            f"SELECT %s AS dt, name, CAST(`{title_field}` AS {text_type}) AS title "
+            f"FROM `tab{doctype}` WHERE name IN ({placeholders})",
+            [doctype, *names]
+        ))
+
+    docs = []
+    if queries:
+        # Savepoints keep a failed statement from aborting the transaction on Postgres
+        frappe.db.savepoint("workz_titles")
+        try:
+            docs = frappe.db.sql(
+                " UNION ALL ".join(query for _dt, query, _params in queries),
+                [param for _dt, _query, params in queries for param in params],
+                as_dict=True
+            )
+        except Exception:
+            frappe.db.rollback(save_point="workz_titles")
+
+            # One bad doctype (virtual, stale or non-column title field) fails
+            # the whole UNION; retry per doctype so only that one falls back
+            for doctype, query, params in queries:
+                frappe.db.savepoint("workz_titles")
+                try:
+                    docs.extend(frappe.db.sql(query, params, as_dict=True))
+                except Exception as e:
+                    frappe.db.rollback(save_point="workz_titles")
+                    failed_doctypes.append((doctype, str(e)))
+                    for name in by_doctype[doctype]:
+                        resolved[f"{doctype}:{name}"] = name
+
+    # Build resolution map, using title field if available
+    for doc in docs:
+        key = f"{doc.dt}:{doc.name}"
+        resolved[key] = str(doc.title).strip() if doc.title else doc.name
+
+    if failed_doctypes:
+        frappe.log_error(f"Failed to resolve references for doctypes: {failed_doctypes}")
+
     return resolved
 
 
@@ -150,11 +195,11 @@ def get_doctype_title_field(doctype):
         frappe.throw(_("Not permitted to access {0}").format(doctype))
     
     try:
-        meta = frappe.get_meta(doctype)
+        title_field = _title_field(doctype)
         return {
             "doctype": doctype,
-            "title_field": meta.title_field or "name",
-            "has_title_field": bool(meta.title_field)
+            "title_field": title_field,
+            "has_title_field": title_field != "name"
         }
     except Exception as e:
         frappe.log_error(f"Failed to get title field for {doctype}: {str(e)}")
@@ -187,8 +232,7 @@ def resolve_single_reference(doctype, name):
     
     try:
         # Get title field
-        meta = frappe.get_meta(doctype)
-        title_field = meta.title_field or "name"
+        title_field = _title_field(doctype)
         
         if title_field == "name":
             return name
@@ -212,64 +256,44 @@ def get_user_todos():
     """
     current_user = frappe.session.user
 
-    # Get todos where user is owner or assigned
-    # Use two separate queries and combine them (simpler approach)
+    # Get todos where user is owner or assigned in a single query
     fields = [
         "name", "description", "reference_name", "reference_type",
         "allocated_to", "priority", "status", "creation", "modified", "owner", "date"
     ]
 
-    # Get todos where user is owner
-    owned_todos = frappe.db.get_list(
-        "ToDo",
-        fields=fields,
-        filters={
-            "reference_type": ["!=", "ToDo"],
-            "owner": current_user
-        },
-        order_by="modified desc",
-        limit=50  # Split the limit between owned and assigned
-    )
-
-    # Get todos where user is assigned
-    assigned_todos = frappe.db.get_list(
+    todos = frappe.db.get_list(
         "ToDo",
         fields=fields,
-        filters={
-            "reference_type": ["!=", "ToDo"],
+        filters={"reference_type": ["!=", "ToDo"]},
+        or_filters={
+            "owner": current_user,
             "allocated_to": current_user
         },
         order_by="modified desc",
-        limit=50
+        limit=100
     )
 
-    # Combine and deduplicate
-    todo_dict = {}
-    for todo in owned_todos + assigned_todos:
-        todo_dict[todo.name] = todo
+    return todos
 
-    # Convert back to list and sort by modified date
-    todos = list(todo_dict.values())
-    todos.sort(key=lambda x: x.get('modified', ''), reverse=True)
 
-    # Limit to 100 total
-    todos = todos[:100]
+# db_type -> SQL rendered once from the query builder in get_user_todos_alternative
+_USER_TODOS_SQL: dict[str, str] = {}
 
-    return todos
 
-
-@frappe.whitelist(allow_guest=False)
-def get_user_todos_alternative():
-    """
-    Alternative implementation using Frappe's query builder.
-    Get todos that the current user created or is assigned to.
-    """
-    current_user = frappe.session.user
+def _user_todos_sql():
+    """Build the user todos query once per database type and reuse its SQL."""
+    db_type = frappe.conf.db_type or "mariadb"
+    sql = _USER_TODOS_SQL.get(db_type)
+    if sql is not None:
+        return sql
 
     # Use Frappe's query builder for more complex queries
     from frappe.query_builder import DocType
+    from pypika.terms import Parameter
 
     todo = DocType("ToDo")
+    user = Parameter("%(user)s")
 
     query = (
         frappe.qb.from_(todo)
@@ -288,15 +312,26 @@ def get_user_todos_alternative():
         )
         .where(
             (todo.reference_type != "ToDo") &
-            ((todo.owner == current_user) | (todo.allocated_to == current_user))
+            ((todo.owner == user) | (todo.allocated_to == user))
         )
         .orderby(todo.modified, order=frappe.qb.desc)
         .limit(100)
     )
 
+    sql = _USER_TODOS_SQL[db_type] = query.get_sql()
+    return sql
+
+
+@frappe.whitelist(allow_guest=False)
+def get_user_todos_alternative():
+    """
+    Alternative implementation using Frappe's query builder.
+    Get todos that the current user created or is assigned to.
+    """
+    current_user = frappe.session.user
+
     try:
-        result = query.run(as_dict=True)
-        return result
+        return frappe.db.sql(_user_todos_sql(), {"user": current_user}, as_dict=True)
     except Exception as e:
         frappe.log_error(f"Query builder failed: {str(e)}")
         # Fallback to simple SQL
@@ -0,0 +1,24 @@
+"""
+SPA bootstrap API for workz app
+- Serves the cached desk boot as JSON so the /workz shell can stay static
+"""
+import frappe
+from werkzeug.wrappers import Response
+
+from workz.boot import get_cached_boot
+
+
+@frappe.whitelist(allow_guest=False)
+def boot():
+    """
+    Return the desk boot for the current user.
+
+    The cached boot is already serialized, so it is wrapped in the usual
+    {"message": ...} envelope as-is instead of being parsed and re-encoded.
+    """
+    boot_json = get_cached_boot(frappe.session.user)
+    return Response(
+        '{"message":' + boot_json + "}",
+        mimetype="application/json",
+        headers={"Cache-Control": "private, no-cache", "Vary": "Cookie"},
+    )
@@ -0,0 +1,134 @@
+"""
+Boot payload for the workz SPA
+- Builds the desk boot JSON (plus workz context) served by workz.api.boot
+- Caches it per user in Redis (zlib-compressed), cleared on login / logout,
+  User changes and clear-cache
+"""
+import json
+import pickle
+import zlib
+
+import frappe
+from frappe.utils.response import json_handler
+
+try:
+    # orjson serializes the large boot dict considerably faster than stdlib json;
+    # datetimes are passed through so they keep Frappe's formatting
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(
+            obj,
+            default=json_handler,
+            option=orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS,
+        ).decode()
+
+except ImportError:
+
+    def _dumps(obj):
+        return json.dumps(obj, default=json_handler, separators=(",", ":"), ensure_ascii=False)
+
+
+BOOT_CACHE_KEY = "workz_boot"
+BOOT_CACHE_TTL = 300  # seconds
+USER_META_CACHE_KEY = "workz_user_meta"
+USER_META_CACHE_TTL = 300  # seconds
+
+USER_INFO_KEYS = ("name", "full_name", "email", "roles")
+
+# Constant for the life of the worker; shared read-only across requests
+_APP_INFO = {
+    "name": "workz",
+    "version": getattr(frappe, "__version__", None),
+}
+
+
+def get_cached_boot(user_id):
+    """
+    Return the SPA boot JSON for a user from Redis, building it on a miss.
+
+    Returns:
+        Boot JSON, as served by workz.api.boot
+    """
+    cached = frappe.cache().get_value(BOOT_CACHE_KEY, user=user_id)
+    if cached is not None:
+        return zlib.decompress(cached).decode()
+
+    try:
+        boot = frappe.sessions.get()
+    except Exception as e:
+        raise frappe.SessionBootFailed from e
+
+    # workz context rides along in the same payload as frappe.boot.workz
+    boot["workz"] = {
+        "site": getattr(frappe.local, "site", None),
+        "user": get_user_info(user_id),
+        "app": _APP_INFO,
+    }
+
+    # Escape "</" so the payload stays safe if it is ever placed in a <script>;
+    # "<\/" is still valid JSON for workz.api.boot
+    boot_json = _dumps(boot).replace("</", "<\\/")
+
+    # Boot JSON is highly repetitive; a fast compression level cuts Redis memory
+    # several-fold for little CPU
+    frappe.cache().set_value(
+        BOOT_CACHE_KEY,
+        zlib.compress(boot_json.encode(), 1),
+        user=user_id,
+        expires_in_sec=BOOT_CACHE_TTL,
+    )
+    return boot_json
+
+
+def get_user_info(user_id):
+    """
+    Return the SPA user info dict. Only called on a boot cache miss, so it
+    always reads the current Redis-cached values.
+    """
+    full_name, roles, email = _user_meta(user_id)
+    return dict(zip(USER_INFO_KEYS, (user_id, full_name, email, roles)))
+
+
+def _user_meta(user_id):
+    """Return (full_name, roles, email) for the user."""
+    cache = frappe.cache()
+
+    # Read our cached (full_name, email) and Frappe's cached roles in one round trip
+    pipe = cache.pipeline()
+    pipe.get(cache.make_key(USER_META_CACHE_KEY, user=user_id))
+    pipe.hget(cache.make_key("roles"), user_id)
+    meta, roles = (pickle.loads(value) if value else None for value in pipe.execute())
+
+    if meta is None:
+        # Login names don't change, so whether it is an email is computed once
+        email = user_id if "@" in (user_id or "") else None
+        meta = (frappe.utils.get_fullname(user_id), email)
+        cache.set_value(USER_META_CACHE_KEY, meta, user=user_id, expires_in_sec=USER_META_CACHE_TTL)
+    if roles is None:
+        roles = frappe.get_roles(user_id)
+
+    full_name, email = meta
+    return full_name, tuple(roles), email
+
+
+def clear_boot_cache(login_manager=None):
+    """on_session_creation / on_logout hook: drop the user's cached boot and meta."""
+    _clear_user(getattr(login_manager, "user", None) or frappe.session.user)
+
+
+def clear_user_boot_cache(doc, method=None):
+    """User doc_events hook: role and name changes must not wait for the TTL."""
+    _clear_user(doc.name)
+
+
+def clear_all_boot_caches():
+    """clear_cache hook: drop every user's cached boot and meta on this site."""
+    # Per-user values live under "user:<uid>:<key>", so match that prefix
+    frappe.cache().delete_keys(f"user:*:{BOOT_CACHE_KEY}")
+    frappe.cache().delete_keys(f"user:*:{USER_META_CACHE_KEY}")
+
+
+def _clear_user(user_id):
+    frappe.cache().delete_value(BOOT_CACHE_KEY, user=user_id)
+    frappe.cache().delete_value(USER_META_CACHE_KEY, user=user_id)
@@ -64,6 +64,12 @@ add_to_apps_screen = [
 # 	"Role": "home_page"
 # }
 
+# Page Renderers
+# --------------
+# Serve the SPA shell without a Jinja render per request
+page_renderer = ["workz.renderer.WorkzPageRenderer"]
+clear_cache = ["workz.renderer.clear_shell_cache", "workz.boot.clear_all_boot_caches"]
+
 # Generators
 # ----------
 
@@ -145,6 +151,13 @@ add_to_apps_screen = [
 # 	}
 # }
 
+doc_events = {
+	"User": {
+		"on_update": "workz.boot.clear_user_boot_cache",
+		"on_trash": "workz.boot.clear_user_boot_cache",
+	},
+}
+
 # Scheduled Tasks
 # ---------------
 
@@ -199,6 +212,11 @@ add_to_apps_screen = [
 # before_request = ["workz.utils.before_request"]
 # after_request = ["workz.utils.after_request"]
 
+# Session Events
+# --------------
+on_session_creation = ["workz.boot.clear_boot_cache"]
+on_logout = ["workz.boot.clear_boot_cache"]
+
 # Job Events
 # ----------
 # before_job = ["workz.utils.before_job"]
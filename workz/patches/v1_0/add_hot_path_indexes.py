@@ -0,0 +1,16 @@
+import frappe
+
+
+def execute():
+    """Add composite indexes matching the ToDo, Comment and Version filters used by workz.api"""
+    # get_user_todos / resolve_references: owner OR allocated_to, ordered by modified
+    frappe.db.add_index("ToDo", ["owner", "modified"], "workz_owner_modified_index")
+    frappe.db.add_index("ToDo", ["allocated_to", "modified"], "workz_allocated_to_modified_index")
+
+    # list_history: activity for one ToDo, ordered by creation
+    frappe.db.add_index(
+        "Comment",
+        ["reference_doctype", "reference_name", "creation"],
+        "workz_reference_creation_index",
+    )
+    frappe.db.add_index("Version", ["ref_doctype", "docname", "creation"], "workz_docname_creation_index")
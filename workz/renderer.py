@@ -0,0 +1,52 @@
+"""
+Page renderer for the workz SPA shell
+- Renders www/workz/index.html through Jinja once and caches the result
+- Per request only the CSRF token is substituted, so Jinja is skipped
+"""
+import os
+from urllib.parse import urlencode
+
+import frappe
+from frappe.website.page_renderers.base_renderer import BaseRenderer
+
+SHELL_CACHE_KEY = "workz_shell"
+SHELL_TEMPLATE = "workz/www/workz/index.html"
+CSRF_PLACEHOLDER = "__WORKZ_CSRF_TOKEN__"
+
+
+def get_shell():
+    """Return the rendered SPA shell with a placeholder for the CSRF token."""
+    # Keyed by the template's mtime so a frontend build that rewrites the
+    # template (and its asset hashes) is picked up without a clear-cache
+    template_path = frappe.get_app_path("workz", "www", "workz", "index.html")
+    version = os.path.getmtime(template_path)
+
+    cached = frappe.cache().get_value(SHELL_CACHE_KEY)
+    if cached is not None and cached[0] == version:
+        return cached[1]
+
+    shell = frappe.render_template(SHELL_TEMPLATE, {"csrf_token": CSRF_PLACEHOLDER})
+    frappe.cache().set_value(SHELL_CACHE_KEY, (version, shell))
+    return shell
+
+
+class WorkzPageRenderer(BaseRenderer):
+    """Serves /workz and its deep links from the cached shell."""
+
+    def can_render(self):
+        return self.path == "workz" or self.path.startswith("workz/")
+
+    def render(self):
+        # Send anonymous hits to login before doing any work
+        if frappe.session.user == "Guest":
+            # Keep the deep link so login lands back on it, as frappe/www/app.py does
+            frappe.redirect(f"/login?{urlencode({'redirect-to': frappe.request.path})}")
+
+        # The page carries the session CSRF token, so it must never be stored
+        html = get_shell().replace(CSRF_PLACEHOLDER, frappe.sessions.get_csrf_token(), 1)
+        return self.build_response(html, headers={"Cache-Control": "private, no-store"})
+
+
+def clear_shell_cache():
+    """clear_cache hook: drop the rendered shell so template changes show up."""
+    frappe.cache().delete_value(SHELL_CACHE_KEY)